@@ -2,38 +2,288 @@
 Gradio app for House Price Prediction Model
 Deploy this to Hugging Face Spaces for interactive inference
 """
+import hashlib
+import importlib.util
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# The forest does not use BLAS/OpenMP, so their thread pools would only contend
+# with Gradio's worker threads. Must be set before numpy is first imported.
+os.environ.setdefault("OMP_NUM_THREADS", "1")
+os.environ.setdefault("MKL_NUM_THREADS", "1")
+os.environ.setdefault("OPENBLAS_NUM_THREADS", "1")
+
+# Multi-stream downloads on a cold cache; must be set before huggingface_hub loads
+if importlib.util.find_spec("hf_transfer") is not None:
+    os.environ.setdefault("HF_HUB_ENABLE_HF_TRANSFER", "1")
+
 import gradio as gr  # type: ignore
 import joblib  # type: ignore
+import numpy as np
 import pandas as pd
-from huggingface_hub import hf_hub_download  # type: ignore
-from typing import Any
+from huggingface_hub import hf_hub_download, try_to_load_from_cache  # type: ignore
+from sklearn.compose import ColumnTransformer  # type: ignore
+from sklearn.impute import SimpleImputer  # type: ignore
+from sklearn.pipeline import Pipeline  # type: ignore
+from sklearn.preprocessing import OneHotEncoder, StandardScaler  # type: ignore
+from typing import Any, Optional
+
+try:
+    import onnxruntime as ort  # type: ignore
+except ImportError:  # Optional: serve the ONNX-converted model when available
+    ort = None
+
+REPO_ID: str = "niru-nny/house-price-prediction"
+# Branch, tag or commit sha of the model repo to serve. Cached files are reused
+# for this revision without asking the Hub, so pin (or bump) a commit sha to
+# make a Space with a persistent cache download a newly pushed model.
+MODEL_REVISION: str = os.environ.get("MODEL_REVISION", "main")
+
+# Number of prediction requests Gradio runs at once, and how many may wait in
+# the queue. The forest's Cython predict releases the GIL, so concurrent
+# requests overlap instead of serializing behind a single worker.
+CONCURRENCY_LIMIT: int = int(os.environ.get("GRADIO_CONCURRENCY_LIMIT", os.cpu_count() or 1))
+QUEUE_MAX_SIZE: int = int(os.environ.get("GRADIO_QUEUE_MAX_SIZE", 64))
+
+# Concurrent requests are coalesced into a single predict call of up to
+# MAX_BATCH_SIZE rows, waiting at most MAX_BATCH_WAIT_MS for a batch to fill.
+MAX_BATCH_SIZE: int = int(os.environ.get("PREDICT_MAX_BATCH_SIZE", 64))
+MAX_BATCH_WAIT_MS: float = float(os.environ.get("PREDICT_MAX_BATCH_WAIT_MS", 5))
+
+# ONNX metadata key holding the SHA-256 of the joblib model it was converted
+# from (written by convert_to_onnx.py)
+ONNX_SOURCE_HASH_KEY: str = "source_model_sha256"
+
+
+def _prefetch(path: str) -> None:
+    """Hint the OS to start reading a file into the page cache (POSIX only)"""
+    if not hasattr(os, "posix_fadvise"):
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+    finally:
+        os.close(fd)
+
+
+def _sha256(path: str) -> str:
+    """Hash a file in 1 MiB chunks"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _resolve_artifact(filename: str) -> str:
+    """
+    Return a local path for a file in the model repo at MODEL_REVISION. A file
+    already in the HF cache for that revision is used as-is, skipping the
+    revalidation request to the Hub; otherwise it is downloaded. Set
+    HF_HUB_OFFLINE=1 to never touch the network.
+    """
+    cached: Any = try_to_load_from_cache(repo_id=REPO_ID, filename=filename, revision=MODEL_REVISION)
+    if isinstance(cached, str):
+        return cached
+    return hf_hub_download(repo_id=REPO_ID, filename=filename, revision=MODEL_REVISION)  # type: ignore
+
 
 print("🔄 Downloading model files...")
 
-# Download model files
+# Download model files concurrently, since they are independent of each other
+_downloads = ThreadPoolExecutor(max_workers=3, thread_name_prefix="hf-download")
+model_future = _downloads.submit(_resolve_artifact, "house_price_model.joblib")
+pipeline_future = _downloads.submit(_resolve_artifact, "preprocessing_pipeline.joblib")
+onnx_future = _downloads.submit(_resolve_artifact, "house_price_model.onnx") if ort is not None else None
+_downloads.shutdown(wait=False)
+
 try:
-    model_path: str = hf_hub_download(  # type: ignore
-        repo_id="niru-nny/house-price-prediction",
-        filename="house_price_model.joblib"
-    )
+    model_path: str = model_future.result()
     print(f"✅ Model downloaded: {model_path}")
     
-    pipeline_path: str = hf_hub_download(  # type: ignore
-        repo_id="niru-nny/house-price-prediction",
-        filename="preprocessing_pipeline.joblib"
-    )
+    pipeline_path: str = pipeline_future.result()
     print(f"✅ Pipeline downloaded: {pipeline_path}")
     
-    # Load model and pipeline
+    # Load model and pipeline. mmap_mode only keeps the pipeline's small arrays
+    # mapped from the HF cache; the trees copy their node arrays on load.
     print("🔄 Loading model and pipeline...")
-    model: Any = joblib.load(model_path)  # type: ignore
-    pipeline: Any = joblib.load(pipeline_path)  # type: ignore
+    _prefetch(model_path)
+    _prefetch(pipeline_path)
+    model: Any = joblib.load(model_path, mmap_mode="r")  # type: ignore
+    pipeline: Any = joblib.load(pipeline_path, mmap_mode="r")  # type: ignore
     print("✅ Model and pipeline loaded successfully!")
     
 except Exception as e:
     print(f"❌ Error loading model: {e}")
     raise
 
+# Prefer ONNX Runtime's fused tree-ensemble kernel when the converted model
+# (see convert_to_onnx.py) is published; otherwise predict with scikit-learn.
+session: Any = None
+if onnx_future is not None:
+    try:
+        onnx_path: str = onnx_future.result()
+        options: Any = ort.SessionOptions()
+        options.intra_op_num_threads = os.cpu_count() or 1
+        candidate: Any = ort.InferenceSession(
+            onnx_path, sess_options=options, providers=["CPUExecutionProvider"]
+        )
+        # A Hub ONNX file that was not regenerated after a model update would
+        # serve a different model, so require it to match the joblib model
+        source_hash = candidate.get_modelmeta().custom_metadata_map.get(ONNX_SOURCE_HASH_KEY)
+        if source_hash == _sha256(model_path):
+            session = candidate
+            print(f"✅ ONNX Runtime session loaded: {onnx_path}")
+        else:
+            print("⚠️  ONNX model was not converted from the current joblib model, using scikit-learn")
+    except Exception as e:
+        print(f"⚠️  ONNX model unavailable, using scikit-learn: {e}")
+
+NUMERIC_FEATURES: list[str] = [
+    'longitude', 'latitude', 'housing_median_age', 'total_rooms',
+    'total_bedrooms', 'population', 'households', 'median_income'
+]
+OCEAN_PROXIMITY_CHOICES: list[str] = ["NEAR BAY", "INLAND", "<1H OCEAN", "NEAR OCEAN", "ISLAND"]
+
+# One reusable 1-row input frame per worker thread. Overwriting its cells in
+# place avoids building a new DataFrame (and re-inferring dtypes) per request.
+_thread_local = threading.local()
+
+
+def _input_frame() -> pd.DataFrame:
+    """Return this thread's cached 1-row input frame, creating it on first use"""
+    frame: Any = getattr(_thread_local, "frame", None)
+    if frame is None:
+        frame = pd.DataFrame({name: [0.0] for name in NUMERIC_FEATURES})
+        frame['ocean_proximity'] = pd.Series([""], dtype=object)
+        _thread_local.frame = frame
+    return frame
+
+
+def _extract_transform_params(pipeline: Any) -> Optional[dict[str, Any]]:
+    """
+    Pull the fitted imputer/scaler/one-hot parameters out of the pipeline so a
+    single row can be transformed with plain NumPy arithmetic. Returns None if
+    the pipeline does not have the expected layout. Mirrors
+    HousePricePredictor._cache_transform_params in inference.py.
+    """
+    if not isinstance(pipeline, ColumnTransformer) or pipeline.remainder != 'drop':
+        return None
+    
+    transformers = {
+        name: (step, columns) for name, step, columns in pipeline.transformers_
+        if name != 'remainder'
+    }
+    if set(transformers) != {'num', 'cat'}:
+        return None
+    num_step, num_columns = transformers['num']
+    cat_step, cat_columns = transformers['cat']
+    
+    if not isinstance(num_step, Pipeline) or len(num_step.steps) != 2:
+        return None
+    imputer, scaler = num_step.steps[0][1], num_step.steps[1][1]
+    if not (isinstance(imputer, SimpleImputer) and not imputer.add_indicator
+            and isinstance(scaler, StandardScaler)):
+        return None
+    if not (isinstance(cat_step, OneHotEncoder) and list(cat_columns) == ['ocean_proximity']
+            and cat_step.drop_idx_ is None and cat_step.handle_unknown == 'error'
+            and set(OCEAN_PROXIMITY_CHOICES) <= set(cat_step.categories_[0])):
+        return None
+    
+    # The fast transform writes the numeric block first and the one-hot
+    # block right after it, so the fitted output layout must match
+    n_numeric = len(num_columns)
+    n_categories = len(cat_step.categories_[0])
+    output_indices = pipeline.output_indices_
+    if (output_indices['num'] != slice(0, n_numeric)
+            or output_indices['cat'] != slice(n_numeric, n_numeric + n_categories)):
+        return None
+    
+    numeric_features = list(num_columns)
+    if sorted(numeric_features) != sorted(NUMERIC_FEATURES):
+        return None
+    return {
+        # Positions of the pipeline's numeric columns within NUMERIC_FEATURES
+        'numeric_order': [NUMERIC_FEATURES.index(name) for name in numeric_features],
+        'medians': imputer.statistics_,
+        'mean': scaler.mean_ if scaler.with_mean else np.zeros(n_numeric),
+        'scale': scaler.scale_ if scaler.with_std else np.ones(n_numeric),
+        'ohe_columns': {
+            category: n_numeric + code for code, category in enumerate(cat_step.categories_[0])
+        },
+        'n_outputs': n_numeric + n_categories,
+    }
+
+
+_transform_params: Optional[dict[str, Any]] = _extract_transform_params(pipeline)
+
+
+def _fast_transform(numeric: np.ndarray, ocean_proximity: str) -> np.ndarray:
+    """Apply the fitted preprocessing to one row without the sklearn pipeline"""
+    params: Any = _transform_params
+    numeric = numeric[params['numeric_order']]
+    numeric = np.where(np.isnan(numeric), params['medians'], numeric)
+    out = np.zeros((1, params['n_outputs']), dtype=np.float32)
+    out[0, :len(numeric)] = (numeric - params['mean']) / params['scale']
+    out[0, params['ohe_columns'][ocean_proximity]] = 1.0
+    return out
+
+
+def _predict_rows(rows: np.ndarray) -> np.ndarray:
+    """Predict preprocessed rows, via ONNX Runtime when a session is loaded"""
+    if session is not None:
+        inputs = {session.get_inputs()[0].name: rows.astype(np.float32, copy=False)}
+        return session.run(None, inputs)[0].ravel()
+    return model.predict(rows)  # type: ignore
+
+
+class _PendingPrediction:
+    """A preprocessed row waiting for the batch worker to fill in its result"""
+    __slots__ = ("row", "done", "result", "error")
+
+    def __init__(self, row: np.ndarray) -> None:
+        self.row = row
+        self.done = threading.Event()
+        self.result: float = 0.0
+        self.error: Optional[BaseException] = None
+
+
+_batch_queue: "queue.Queue[_PendingPrediction]" = queue.Queue()
+
+
+def _batch_worker() -> None:
+    """Collect queued rows, predict them in one call and scatter the results"""
+    while True:
+        batch = [_batch_queue.get()]
+        deadline = time.monotonic() + MAX_BATCH_WAIT_MS / 1000
+        while len(batch) < MAX_BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(_batch_queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        try:
+            predictions = _predict_rows(np.vstack([item.row for item in batch]))
+        except Exception as e:
+            for item in batch:
+                item.error = e
+                item.done.set()
+            continue
+
+        for item, prediction in zip(batch, predictions):
+            item.result = float(prediction)
+            item.done.set()
+
+
+threading.Thread(target=_batch_worker, name="predict-batcher", daemon=True).start()
+
+
 def predict_price(
     longitude: float, 
     latitude: float, 
@@ -47,25 +297,38 @@ def predict_price(
 ) -> str:
     """Predict house price based on input features"""
     
-    # Create input dataframe
-    input_data = pd.DataFrame({
-        'longitude': [longitude],
-        'latitude': [latitude],
-        'housing_median_age': [housing_median_age],
-        'total_rooms': [total_rooms],
-        'total_bedrooms': [total_bedrooms],
-        'population': [population],
-        'households': [households],
-        'median_income': [median_income],
-        'ocean_proximity': [ocean_proximity]
-    })
+    numeric_values = (
+        longitude, latitude, housing_median_age, total_rooms,
+        total_bedrooms, population, households, median_income
+    )
+    
+    if _transform_params is not None:
+        # Preprocess with NumPy directly, skipping the pipeline's dispatch
+        numeric = np.array(numeric_values, dtype=np.float64)
+        processed_data: Any = _fast_transform(numeric, ocean_proximity)
+    else:
+        # Fill this thread's cached input frame in place
+        input_data = _input_frame()
+        for column, value in enumerate(numeric_values):
+            # An empty Gradio number arrives as None; NaN lets the imputer fill it
+            input_data.iat[0, column] = np.nan if value is None else value
+        input_data.iat[0, 8] = ocean_proximity
+        processed_data = pipeline.transform(input_data)  # type: ignore
     
-    # Preprocess and predict
-    processed_data: Any = pipeline.transform(input_data)  # type: ignore
-    prediction: float = model.predict(processed_data)[0]  # type: ignore
+    # Hand the row to the batch worker and wait for its prediction
+    pending = _PendingPrediction(processed_data)
+    _batch_queue.put(pending)
+    pending.done.wait()
+    if pending.error is not None:
+        raise pending.error
+    prediction = pending.result
     
     return f"${prediction:,.2f}"
 
+# Warm up the preprocessing, model and batch worker so the first user request
+# does not pay for lazy imports and first-call setup
+predict_price(-122.23, 37.88, 41, 880, 129, 322, 126, 8.3252, "NEAR BAY")
+
 # Create Gradio interface
 demo: Any = gr.Interface(  # type: ignore
     fn=predict_price,
@@ -79,7 +342,7 @@ demo: Any = gr.Interface(  # type: ignore
         gr.Slider(0, 6000, value=126, step=1, label="Households"),
         gr.Slider(0, 15, value=8.3252, step=0.1, label="Median Income (in $10,000s)"),
         gr.Dropdown(
-            choices=["NEAR BAY", "INLAND", "<1H OCEAN", "NEAR OCEAN", "ISLAND"],
+            choices=OCEAN_PROXIMITY_CHOICES,
             value="NEAR BAY",
             label="Ocean Proximity"
         )
@@ -94,4 +357,7 @@ demo: Any = gr.Interface(  # type: ignore
 )
 
 if __name__ == "__main__":
-    demo.launch()
+    demo.queue(  # type: ignore
+        default_concurrency_limit=CONCURRENCY_LIMIT,
+        max_size=QUEUE_MAX_SIZE
+    ).launch()
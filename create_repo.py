@@ -1,15 +1,15 @@
-from huggingface_hub import create_repo
+from huggingface_hub import HfApi
 import os
 
 token = os.environ.get('HF_TOKEN', 'YOUR_TOKEN_HERE')
 
 try:
-    repo = create_repo(
+    api = HfApi(token=token)
+    repo = api.create_repo(
         repo_id="house-price-prediction",
         repo_type="model",
         private=False,
-        exist_ok=True,
-        token=token
+        exist_ok=True
     )
     print(f"✅ Repository created/ready: {repo}")
 except Exception as e:
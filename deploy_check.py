@@ -1,23 +1,23 @@
 #!/usr/bin/env python3
-from huggingface_hub import create_repo, HfApi
+from huggingface_hub import HfApi
 import os
 
 token = os.environ.get('HF_TOKEN', 'YOUR_TOKEN_HERE')
 
 try:
-    api = HfApi()
+    # One client for every call, so they share its HTTP session
+    api = HfApi(token=token)
     
     # First verify token is valid
-    user = api.whoami(token=token) # pyright: ignore[reportUnknownMemberType, reportUnknownVariableType]
+    user = api.whoami() # pyright: ignore[reportUnknownMemberType, reportUnknownVariableType]
     print(f"✅ Authenticated as: {user['name']}")
     
     # Try to create repo - it might already exist
-    repo = create_repo(
+    repo = api.create_repo(
         repo_id="house-price-prediction",
         repo_type="model",
         private=False,
-        exist_ok=True,
-        token=token
+        exist_ok=True
     )
     print(f"✅ Repository ready: {repo}")
     
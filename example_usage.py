@@ -115,11 +115,11 @@ def example_batch_predictions():
     print("\n" + "-"*60)
     print("PREDICTIONS:")
     print("-"*60)
-    for i, (_, row) in enumerate(houses.iterrows()):  # pyright: ignore[reportUnknownVariableType]
+    for i, row in enumerate(houses.itertuples(index=False)):  # pyright: ignore[reportUnknownVariableType]
         print(f"\nHouse {i+1}:")
-        print(f"  Location: ({row['longitude']:.2f}, {row['latitude']:.2f})")
-        print(f"  Ocean Proximity: {row['ocean_proximity']}")
-        print(f"  Median Income: ${row['median_income']*10000:,.0f}")
+        print(f"  Location: ({row.longitude:.2f}, {row.latitude:.2f})")
+        print(f"  Ocean Proximity: {row.ocean_proximity}")
+        print(f"  Median Income: ${row.median_income*10000:,.0f}")
         print(f"  ➡️  Predicted Price: ${predictions[i]:,.2f}")
 
 
@@ -150,13 +150,14 @@ def example_different_ocean_proximities():
           f"Age={base_house['housing_median_age']:.0f} years")
     print("\n" + "-"*60)
     
-    predictions = []  # pyright: ignore[reportUnknownVariableType]
-    for proximity in ocean_proximities:
-        house = base_house.copy()  # pyright: ignore[reportUnknownVariableType,reportUnknownMemberType]
-        house['ocean_proximity'] = proximity  # pyright: ignore[reportArgumentType, reportUnknownVariableType,reportUnknownMemberType]
-        prediction = predictor.predict(house)  # pyright: ignore[reportUnknownVariableType,reportUnknownMemberType]
-        predictions.append((proximity, prediction[0]))  # pyright: ignore[reportUnknownVariableType,reportUnknownMemberType]
-        print(f"{proximity:15s} ➡️  ${prediction[0]:,.2f}")
+    # Predict all variants in a single batch instead of one call per proximity
+    houses = pd.DataFrame([base_house] * len(ocean_proximities))
+    houses['ocean_proximity'] = ocean_proximities
+    prices = predictor.predict(houses)  # pyright: ignore[reportUnknownVariableType,reportUnknownMemberType]
+    
+    predictions = list(zip(ocean_proximities, prices))  # pyright: ignore[reportUnknownVariableType,reportUnknownArgumentType]
+    for proximity, price in predictions:  # pyright: ignore[reportUnknownVariableType]
+        print(f"{proximity:15s} ➡️  ${price:,.2f}")
     
     # Find the most expensive
     most_expensive = max(predictions, key=lambda x: x[1])  # pyright: ignore[reportUnknownArgumentType, reportUnknownVariableType,reportUnknownLambdaType,reportUnknownParameterType]
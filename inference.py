@@ -5,11 +5,52 @@ This module provides a simple API for loading the trained California house price
 prediction model and making predictions on new data.
 """
 
+import hashlib
+import os
+
 import joblib
 import pandas as pd
 import numpy as np
 from pathlib import Path
-from typing import Union, Dict, List
+from typing import Union, Dict, List, Optional
+from sklearn.compose import ColumnTransformer
+from sklearn.impute import SimpleImputer
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+try:
+    import onnxruntime as ort
+except ImportError:  # Optional: only needed to serve the ONNX-converted model
+    ort = None
+
+
+# Batches at least this large are predicted with one thread per core; smaller
+# inputs stay sequential because thread dispatch would cost more than it saves.
+PARALLEL_MIN_ROWS = 1000
+
+# ONNX metadata key holding the SHA-256 of the joblib model it was converted
+# from (written by convert_to_onnx.py)
+ONNX_SOURCE_HASH_KEY = 'source_model_sha256'
+
+
+def _prefetch(path: Path):
+    """Hint the OS to start reading a file into the page cache (POSIX only)."""
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+    finally:
+        os.close(fd)
+
+
+def _sha256(path: Path) -> str:
+    """Hash a file in 1 MiB chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
 
 
 class HousePricePredictor:
@@ -20,38 +61,219 @@ class HousePricePredictor:
     and provides methods for making predictions on new housing data.
     """
     
+    __slots__ = (
+        'model_path', 'pipeline_path', 'onnx_path', 'model', 'pipeline',
+        'feature_names', 'valid_ocean_proximity', '_feature_fset', '_ocean_fset',
+        '_session', '_session_input', '_n_jobs', '_fast_path', '_numeric_features',
+        '_medians', '_mean', '_scale', '_ohe_columns', '_cat_offset', '_n_outputs',
+        'ocean_proximity_codes'
+    )
+    
     def __init__(self, model_path: str = "house_price_model.joblib", 
-                 pipeline_path: str = "preprocessing_pipeline.joblib"):
+                 pipeline_path: str = "preprocessing_pipeline.joblib",
+                 onnx_path: Optional[str] = None):
         """
         Initialize the predictor by loading the model and preprocessing pipeline.
         
         Args:
             model_path: Path to the trained model joblib file
             pipeline_path: Path to the preprocessing pipeline joblib file
+            onnx_path: Path to the ONNX-converted model (see convert_to_onnx.py).
+                       Defaults to model_path with an .onnx suffix. Used instead
+                       of the scikit-learn model when the file exists, was
+                       converted from model_path, and onnxruntime is installed.
         """
         self.model_path = Path(model_path)
         self.pipeline_path = Path(pipeline_path)
+        self.onnx_path = Path(onnx_path) if onnx_path is not None else self.model_path.with_suffix('.onnx')
         self.model = None
         self.pipeline = None
+        self._session = None
+        self._session_input = None
+        self._n_jobs = max(1, (os.cpu_count() or 1) - 1)
         self.feature_names = [
             'longitude', 'latitude', 'housing_median_age', 'total_rooms',
             'total_bedrooms', 'population', 'households', 'median_income',
             'ocean_proximity'
         ]
         self.valid_ocean_proximity = ['<1H OCEAN', 'INLAND', 'NEAR OCEAN', 'NEAR BAY', 'ISLAND']
+        self._feature_fset = frozenset(self.feature_names)
+        self._ocean_fset = frozenset(self.valid_ocean_proximity)
         
-    def load(self):
-        """Load the model and preprocessing pipeline from disk."""
+        # Fitted preprocessing parameters for the single-row fast path,
+        # filled in by load() when the pipeline layout is recognised.
+        self._fast_path = False
+        self._numeric_features = []
+        self._medians = None
+        self._mean = None
+        self._scale = None
+        self._ohe_columns = {}
+        self._cat_offset = 0
+        self._n_outputs = 0
+        # Integer code of each ocean_proximity category, for predict_array()
+        self.ocean_proximity_codes = {}
+        
+    def load(self, mmap_mode: Optional[str] = 'r'):
+        """
+        Load the model and preprocessing pipeline from disk.
+        
+        By default NumPy arrays in the artifacts are memory-mapped read-only.
+        Only arrays that scikit-learn keeps as-is stay mapped, such as the
+        pipeline's fitted statistics; the forest's trees copy their node
+        arrays when unpickled, so the model still takes its full size in
+        memory. Read-only maps are safe because scikit-learn never mutates
+        fitted attributes at predict time. This requires uncompressed dumps
+        (``joblib.dump(..., compress=0)``); compressed files are loaded
+        normally. The artifacts must be read with joblib rather than
+        ``pickle.load``: joblib writes array buffers outside the pickle stream.
+        
+        Args:
+            mmap_mode: Passed to ``joblib.load``; None reads arrays into memory
+        """
         if not self.model_path.exists():
             raise FileNotFoundError(f"Model file not found: {self.model_path}")
         if not self.pipeline_path.exists():
             raise FileNotFoundError(f"Pipeline file not found: {self.pipeline_path}")
-            
-        self.model = joblib.load(self.model_path)
-        self.pipeline = joblib.load(self.pipeline_path)
+        
+        _prefetch(self.model_path)
+        _prefetch(self.pipeline_path)
+        self.model = joblib.load(self.model_path, mmap_mode=mmap_mode)
+        self.pipeline = joblib.load(self.pipeline_path, mmap_mode=mmap_mode)
+        self._cache_transform_params()
         print(f"✅ Model loaded successfully from {self.model_path}")
         print(f"✅ Pipeline loaded successfully from {self.pipeline_path}")
         
+        self._session = None
+        self._session_input = None
+        if ort is not None and self.onnx_path.exists():
+            options = ort.SessionOptions()
+            options.intra_op_num_threads = os.cpu_count() or 1
+            try:
+                session = ort.InferenceSession(
+                    str(self.onnx_path), sess_options=options, providers=['CPUExecutionProvider']
+                )
+                # Only serve the ONNX model if it was converted from this exact joblib file
+                source_hash = session.get_modelmeta().custom_metadata_map.get(ONNX_SOURCE_HASH_KEY)
+            except Exception as e:
+                # Corrupt file, un-pulled LFS pointer, or an opset this onnxruntime lacks
+                print(f"⚠️  Could not load {self.onnx_path}, using scikit-learn: {e}")
+            else:
+                if source_hash == _sha256(self.model_path):
+                    self._session = session
+                    self._session_input = session.get_inputs()[0].name
+                    print(f"✅ ONNX Runtime session loaded from {self.onnx_path}")
+                else:
+                    print(f"⚠️  {self.onnx_path} was not converted from {self.model_path}, "
+                          f"using scikit-learn (re-run convert_to_onnx.py)")
+        
+        self._warm_up()
+    
+    def _warm_up(self):
+        """
+        Run throwaway predictions through the batch and single-row paths so the
+        first real request does not pay for lazy imports and first-call setup.
+        """
+        example = {
+            'longitude': -122.23, 'latitude': 37.88,
+            'housing_median_age': 41.0, 'total_rooms': 880.0,
+            'total_bedrooms': 129.0, 'population': 322.0,
+            'households': 126.0, 'median_income': 8.3252,
+            'ocean_proximity': 'NEAR BAY'
+        }
+        self.predict(pd.DataFrame([example, example]))
+        self.predict(example)
+    
+    def _cache_transform_params(self):
+        """
+        Extract the fitted preprocessing parameters used by the single-row fast path.
+        
+        The fast path is only enabled when the pipeline has the layout it was
+        trained with (median imputer and standard scaler on the numeric columns,
+        one-hot encoding of ocean_proximity). Any other layout keeps every
+        prediction on ``pipeline.transform``.
+        """
+        self._fast_path = False
+        pipeline = self.pipeline
+        if not isinstance(pipeline, ColumnTransformer) or pipeline.remainder != 'drop':
+            return
+        
+        transformers = {
+            name: (step, columns) for name, step, columns in pipeline.transformers_
+            if name != 'remainder'
+        }
+        if set(transformers) != {'num', 'cat'}:
+            return
+        num_step, num_columns = transformers['num']
+        cat_step, cat_columns = transformers['cat']
+        
+        if not isinstance(num_step, Pipeline) or len(num_step.steps) != 2:
+            return
+        imputer, scaler = num_step.steps[0][1], num_step.steps[1][1]
+        if not (isinstance(imputer, SimpleImputer) and not imputer.add_indicator
+                and isinstance(scaler, StandardScaler)):
+            return
+        if not (isinstance(cat_step, OneHotEncoder) and list(cat_columns) == ['ocean_proximity']
+                and cat_step.drop_idx_ is None and cat_step.handle_unknown == 'error'
+                and set(self.valid_ocean_proximity) <= set(cat_step.categories_[0])):
+            return
+        
+        # The fast transform writes the numeric block first and the one-hot
+        # block right after it, so the fitted output layout must match
+        n_numeric = len(num_columns)
+        n_categories = len(cat_step.categories_[0])
+        output_indices = pipeline.output_indices_
+        if (output_indices['num'] != slice(0, n_numeric)
+                or output_indices['cat'] != slice(n_numeric, n_numeric + n_categories)):
+            return
+        
+        self._cat_offset = cat_offset = n_numeric
+        self._numeric_features = list(num_columns)
+        self._medians = imputer.statistics_
+        self._mean = scaler.mean_ if scaler.with_mean else np.zeros(len(num_columns))
+        self._scale = scaler.scale_ if scaler.with_std else np.ones(len(num_columns))
+        self.ocean_proximity_codes = {
+            category: i for i, category in enumerate(cat_step.categories_[0])
+        }
+        self._ohe_columns = {
+            category: cat_offset + code for category, code in self.ocean_proximity_codes.items()
+        }
+        self._n_outputs = cat_offset + n_categories
+        self._fast_path = True
+    
+    def _fast_transform(self, numeric: np.ndarray, ocean_proximity: str) -> np.ndarray:
+        """
+        Transform one row without going through the sklearn pipeline.
+        
+        Applies the same arithmetic as the fitted pipeline (impute, scale,
+        one-hot encode) directly in NumPy. The result is float32 because that
+        is the dtype the forest converts its input to anyway. This costs a few
+        microseconds against milliseconds for ``model.predict``, so it is kept
+        in plain NumPy rather than JIT-compiled.
+        
+        Args:
+            numeric: 1-D float64 array of the numeric features, in pipeline order
+            ocean_proximity: Category of the ocean_proximity feature
+            
+        Returns:
+            Array of shape (1, n_outputs) ready for ``model.predict``
+        """
+        numeric = np.where(np.isnan(numeric), self._medians, numeric)
+        out = np.zeros((1, self._n_outputs), dtype=np.float32)
+        out[0, :len(numeric)] = (numeric - self._mean) / self._scale
+        out[0, self._ohe_columns[ocean_proximity]] = 1.0
+        return out
+        
+    def _predict_prepared(self, prepared_data: np.ndarray) -> np.ndarray:
+        """Run the regressor on preprocessed features, via ONNX Runtime when loaded."""
+        if self._session is not None:
+            inputs = {self._session_input: np.asarray(prepared_data, dtype=np.float32)}
+            return self._session.run(None, inputs)[0].ravel().astype(np.float64)
+        if len(prepared_data) >= PARALLEL_MIN_ROWS and self._n_jobs > 1:
+            # Tree predict releases the GIL, so threads parallelize across trees
+            with joblib.parallel_config(backend='threading', n_jobs=self._n_jobs):
+                return self.model.predict(prepared_data)
+        return self.model.predict(prepared_data)
+    
     def validate_input(self, data: pd.DataFrame):
         """
         Validate that input data has all required features.
@@ -62,13 +284,23 @@ class HousePricePredictor:
         Raises:
             ValueError: If required features are missing or invalid
         """
-        missing_features = set(self.feature_names) - set(data.columns)
+        missing_features = self._feature_fset.difference(data.columns)
         if missing_features:
-            raise ValueError(f"Missing required features: {missing_features}")
+            raise ValueError(f"Missing required features: {set(missing_features)}")
         
         # Validate ocean_proximity values
-        invalid_values = set(data['ocean_proximity'].unique()) - set(self.valid_ocean_proximity)
-        if invalid_values:
+        ocean_proximity = data['ocean_proximity']
+        if len(data) == 1:
+            valid = ocean_proximity.iat[0] in self._ocean_fset
+        elif isinstance(ocean_proximity.dtype, pd.CategoricalDtype):
+            # Check each category once, then the integer codes, not every string
+            valid_categories = ocean_proximity.cat.categories.isin(self._ocean_fset)
+            codes = ocean_proximity.cat.codes.to_numpy()
+            valid = (codes >= 0).all() and (valid_categories.all() or valid_categories[codes].all())
+        else:
+            valid = ocean_proximity.isin(self._ocean_fset).all()
+        if not valid:
+            invalid_values = set(ocean_proximity.unique()) - self._ocean_fset
             raise ValueError(
                 f"Invalid ocean_proximity values: {invalid_values}. "
                 f"Valid values are: {self.valid_ocean_proximity}"
@@ -90,7 +322,9 @@ class HousePricePredictor:
                   - households (float): Total number of households in the block
                   - median_income (float): Median income of households (in tens of thousands)
                   - ocean_proximity (str): Proximity to ocean, one of:
-                    '<1H OCEAN', 'INLAND', 'NEAR OCEAN', 'NEAR BAY', 'ISLAND'
+                    '<1H OCEAN', 'INLAND', 'NEAR OCEAN', 'NEAR BAY', 'ISLAND'.
+                    A pandas categorical column is accepted and validated
+                    faster than plain strings.
         
         Returns:
             numpy array of predicted house prices (in dollars)
@@ -117,6 +351,8 @@ class HousePricePredictor:
         
         # Convert input to DataFrame if needed
         if isinstance(data, dict):
+            if self._fast_path:
+                return self._predict_single_dict(data)
             data = pd.DataFrame([data])
         elif isinstance(data, list):
             data = pd.DataFrame(data)
@@ -126,14 +362,89 @@ class HousePricePredictor:
         # Validate input
         self.validate_input(data)
         
-        # Prepare data using the preprocessing pipeline
-        prepared_data = self.pipeline.transform(data)
+        # Prepare data, bypassing the pipeline's Python dispatch for single rows
+        if self._fast_path and len(data) == 1:
+            numeric = data[self._numeric_features].to_numpy(dtype=np.float64)[0]
+            prepared_data = self._fast_transform(numeric, data['ocean_proximity'].iat[0])
+        else:
+            prepared_data = self.pipeline.transform(data)
         
         # Make predictions
-        predictions = self.model.predict(prepared_data)
+        predictions = self._predict_prepared(prepared_data)
         
         return predictions
     
+    def _predict_single_dict(self, data: Dict) -> np.ndarray:
+        """
+        Predict one house given as a dict, without building a DataFrame.
+        
+        Performs the same checks as ``validate_input`` and feeds the values
+        straight into the single-row fast transform.
+        """
+        missing_features = self._feature_fset.difference(data)
+        if missing_features:
+            raise ValueError(f"Missing required features: {set(missing_features)}")
+        
+        ocean_proximity = data['ocean_proximity']
+        if ocean_proximity not in self._ocean_fset:
+            raise ValueError(
+                f"Invalid ocean_proximity values: {{{ocean_proximity!r}}}. "
+                f"Valid values are: {self.valid_ocean_proximity}"
+            )
+        
+        numeric = np.array([data[name] for name in self._numeric_features], dtype=np.float64)
+        return self._predict_prepared(self._fast_transform(numeric, ocean_proximity))
+    
+    def predict_array(self, x: np.ndarray) -> np.ndarray:
+        """
+        Make predictions on a raw feature matrix, skipping DataFrame handling
+        and the sklearn pipeline.
+        
+        The caller guarantees the column layout, so no column lookup or
+        string validation is done. Use ``predict`` when the layout is unknown.
+        
+        Args:
+            x: Array of shape (n_samples, 9) with columns in ``feature_names``
+               order. The ocean_proximity column holds the integer codes from
+               ``ocean_proximity_codes`` instead of strings.
+        
+        Returns:
+            numpy array of predicted house prices (in dollars)
+            
+        Example:
+            >>> codes = predictor.ocean_proximity_codes
+            >>> x = np.array([[-122.23, 37.88, 41.0, 880.0, 129.0, 322.0,
+            ...                126.0, 8.3252, codes['NEAR BAY']]])
+            >>> predictor.predict_array(x)
+        """
+        if self.model is None or self.pipeline is None:
+            raise RuntimeError("Model not loaded. Call load() first.")
+        if not self._fast_path:
+            raise RuntimeError("predict_array() is not supported for this preprocessing pipeline")
+        
+        x = np.asarray(x, dtype=np.float64)
+        if x.ndim != 2 or x.shape[1] != len(self.feature_names):
+            raise ValueError(
+                f"Expected an array of shape (n_samples, {len(self.feature_names)}), got {x.shape}"
+            )
+        
+        ocean_column = self.feature_names.index('ocean_proximity')
+        codes = x[:, ocean_column]
+        n_categories = len(self.ocean_proximity_codes)
+        if not ((codes >= 0) & (codes < n_categories) & (codes == np.floor(codes))).all():
+            raise ValueError(
+                f"Invalid ocean_proximity codes; valid codes are: {self.ocean_proximity_codes}"
+            )
+        
+        numeric = x[:, [self.feature_names.index(name) for name in self._numeric_features]]
+        numeric = np.where(np.isnan(numeric), self._medians, numeric)
+        
+        prepared_data = np.zeros((len(x), self._n_outputs), dtype=np.float32)
+        prepared_data[:, :numeric.shape[1]] = (numeric - self._mean) / self._scale
+        prepared_data[np.arange(len(x)), self._cat_offset + codes.astype(np.intp)] = 1.0
+        
+        return self._predict_prepared(prepared_data)
+    
     def predict_single(self, longitude: float, latitude: float, 
                       housing_median_age: float, total_rooms: float,
                       total_bedrooms: float, population: float,
@@ -174,18 +485,21 @@ class HousePricePredictor:
 
 # Convenience functions for quick use
 def load_model(model_path: str = "house_price_model.joblib",
-               pipeline_path: str = "preprocessing_pipeline.joblib") -> HousePricePredictor:
+               pipeline_path: str = "preprocessing_pipeline.joblib",
+               onnx_path: Optional[str] = None) -> HousePricePredictor:
     """
     Load and return a HousePricePredictor instance.
     
     Args:
         model_path: Path to the trained model joblib file
         pipeline_path: Path to the preprocessing pipeline joblib file
+        onnx_path: Path to the optional ONNX-converted model; defaults to
+                   model_path with an .onnx suffix
         
     Returns:
         Loaded HousePricePredictor instance
     """
-    predictor = HousePricePredictor(model_path, pipeline_path)
+    predictor = HousePricePredictor(model_path, pipeline_path, onnx_path)
     predictor.load()
     return predictor
 
@@ -5,16 +5,65 @@ Run this script to verify everything is set up correctly before deployment.
 This performs basic smoke tests on the model and inference API.
 """
 
+import importlib.metadata
+import importlib.util
+import os
 import sys
-from pathlib import Path
 from typing import Any
 
+BANNER = "=" * 70
+SUBSEP = "-" * 70
+
+# numpy module, imported by main() once test 1 has confirmed it is installed
+np: Any = None
+
+
+def _header(title: str) -> str:
+    """Format a section title between two banner lines."""
+    return f"{BANNER}\n{title}\n{BANNER}"
+
+
+# Known houses with a plausible price range, shared by the prediction tests
+TEST_CASES: list[dict[str, Any]] = [
+    {
+        'name': 'Expensive Bay Area house',
+        'data': {
+            'longitude': -122.23, 'latitude': 37.88,
+            'housing_median_age': 41.0, 'total_rooms': 880.0,
+            'total_bedrooms': 129.0, 'population': 322.0,
+            'households': 126.0, 'median_income': 8.3252,
+            'ocean_proximity': 'NEAR BAY'
+        },
+        'expected_range': (300000, 600000)
+    },
+    {
+        'name': 'Inland moderate house',
+        'data': {
+            'longitude': -119.56, 'latitude': 36.78,
+            'housing_median_age': 15.0, 'total_rooms': 4500.0,
+            'total_bedrooms': 800.0, 'population': 1800.0,
+            'households': 750.0, 'median_income': 3.2,
+            'ocean_proximity': 'INLAND'
+        },
+        'expected_range': (100000, 300000)
+    },
+    {
+        'name': 'Coastal high-income house',
+        'data': {
+            'longitude': -118.40, 'latitude': 34.07,
+            'housing_median_age': 35.0, 'total_rooms': 2500.0,
+            'total_bedrooms': 500.0, 'population': 1200.0,
+            'households': 450.0, 'median_income': 7.5,
+            'ocean_proximity': '<1H OCEAN'
+        },
+        'expected_range': (250000, 550000)
+    }
+]
+
 
 def test_imports():
     """Test that all required packages are installed."""
-    print("=" * 70)
-    print("TEST 1: Checking Required Packages")
-    print("=" * 70)
+    print(_header("TEST 1: Checking Required Packages"))
     
     required_packages = {
         'sklearn': 'scikit-learn',
@@ -23,14 +72,18 @@ def test_imports():
         'joblib': 'joblib'
     }
     
+    # Locate each package without executing it; the later tests do the real imports
     missing: list[str] = []
     for module_name, package_name in required_packages.items():
-        try:
-            __import__(module_name)
-            print(f"✅ {package_name} is installed")
-        except ImportError:
+        if importlib.util.find_spec(module_name) is None:
             print(f"❌ {package_name} is NOT installed")
             missing.append(package_name)
+            continue
+        try:
+            version = importlib.metadata.version(package_name)
+        except importlib.metadata.PackageNotFoundError:
+            version = 'unknown version'
+        print(f"✅ {package_name} is installed ({version})")
     
     if missing:
         print(f"\n⚠️  Missing packages: {', '.join(missing)}")
@@ -43,9 +96,7 @@ def test_imports():
 
 def test_files():
     """Test that all required files exist."""
-    print("=" * 70)
-    print("TEST 2: Checking Required Files")
-    print("=" * 70)
+    print(_header("TEST 2: Checking Required Files"))
     
     required_files = [
         'house_price_model.joblib',
@@ -58,17 +109,21 @@ def test_files():
         'example_usage.py'
     ]
     
-    missing: list[str] = []
-    for filename in required_files:
-        filepath = Path(filename)
-        if filepath.exists():
-            size = filepath.stat().st_size
-            size_str = f"{size:,} bytes" if size < 1024 else f"{size/1024:.1f} KB" if size < 1024*1024 else f"{size/(1024*1024):.1f} MB"
-            print(f"✅ {filename:35s} ({size_str})")
-        else:
-            print(f"❌ {filename:35s} (MISSING)")
-            missing.append(filename)
+    # One directory scan instead of an exists() and stat() call per file
+    with os.scandir('.') as entries:
+        sizes = {entry.name: entry.stat().st_size for entry in entries if entry.is_file()}
     
+    lines: list[str] = []
+    for filename in required_files:
+        size = sizes.get(filename)
+        if size is None:
+            lines.append(f"❌ {filename:35s} (MISSING)")
+            continue
+        size_str = f"{size:,} bytes" if size < 1024 else f"{size/1024:.1f} KB" if size < 1024*1024 else f"{size/(1024*1024):.1f} MB"
+        lines.append(f"✅ {filename:35s} ({size_str})")
+    print('\n'.join(lines))
+    
+    missing = [filename for filename in required_files if filename not in sizes]
     if missing:
         print(f"\n⚠️  Missing files: {', '.join(missing)}")
         return False
@@ -79,15 +134,13 @@ def test_files():
 
 def test_model_loading() -> tuple[bool, Any]:
     """Test that the model can be loaded."""
-    print("=" * 70)
-    print("TEST 3: Loading Model and Pipeline")
-    print("=" * 70)
+    print(_header("TEST 3: Loading Model and Pipeline"))
     
     try:
         from inference import HousePricePredictor
         
         predictor = HousePricePredictor()
-        predictor.load()
+        predictor.load(mmap_mode='r')
         
         print("✅ Model and pipeline loaded successfully!\n")
         return True, predictor
@@ -97,114 +150,79 @@ def test_model_loading() -> tuple[bool, Any]:
         return False, None
 
 
-def test_prediction(predictor: Any) -> bool:
+def test_prediction(predictor: Any, sample_frame: Any) -> tuple[bool, Any]:
     """Test that predictions work correctly."""
-    print("=" * 70)
-    print("TEST 4: Making Test Predictions")
-    print("=" * 70)
-    
-    test_cases: list[dict[str, Any]] = [
-        {
-            'name': 'Expensive Bay Area house',
-            'data': {
-                'longitude': -122.23, 'latitude': 37.88,
-                'housing_median_age': 41.0, 'total_rooms': 880.0,
-                'total_bedrooms': 129.0, 'population': 322.0,
-                'households': 126.0, 'median_income': 8.3252,
-                'ocean_proximity': 'NEAR BAY'
-            },
-            'expected_range': (300000, 600000)
-        },
-        {
-            'name': 'Inland moderate house',
-            'data': {
-                'longitude': -119.56, 'latitude': 36.78,
-                'housing_median_age': 15.0, 'total_rooms': 4500.0,
-                'total_bedrooms': 800.0, 'population': 1800.0,
-                'households': 750.0, 'median_income': 3.2,
-                'ocean_proximity': 'INLAND'
-            },
-            'expected_range': (100000, 300000)
-        },
-        {
-            'name': 'Coastal high-income house',
-            'data': {
-                'longitude': -118.40, 'latitude': 34.07,
-                'housing_median_age': 35.0, 'total_rooms': 2500.0,
-                'total_bedrooms': 500.0, 'population': 1200.0,
-                'households': 450.0, 'median_income': 7.5,
-                'ocean_proximity': '<1H OCEAN'
-            },
-            'expected_range': (250000, 550000)
-        }
-    ]
+    print(_header("TEST 4: Making Test Predictions"))
     
-    all_passed = True
+    # Predict every valid sample in one batched call; the batch test checks
+    # its own predictions against these
+    try:
+        prices = predictor.predict(sample_frame)
+    except Exception as e:
+        print(f"❌ Prediction failed: {e}")
+        print("\n⚠️  Some predictions had issues\n")
+        return False, None
     
-    for i, test in enumerate(test_cases, 1):
+    for i, (test, price) in enumerate(zip(TEST_CASES, prices), 1):
         print(f"\nTest case {i}: {test['name']}")
-        print("-" * 70)
+        print(SUBSEP)
         
-        try:
-            prediction = predictor.predict(test['data'])
-            price = prediction[0]
-            min_price, max_price = test['expected_range']
-            
-            print(f"Input: Income=${test['data']['median_income']*10000:,.0f}, "
-                  f"Location=({test['data']['longitude']}, {test['data']['latitude']}), "
-                  f"Proximity={test['data']['ocean_proximity']}")
-            print(f"Predicted price: ${price:,.2f}")
-            
-            if min_price <= price <= max_price:
-                print(f"✅ Prediction is within expected range (${min_price:,} - ${max_price:,})")
-            else:
-                print(f"⚠️  Prediction outside expected range (${min_price:,} - ${max_price:,})")
-                print("   (This might be okay, just flagging for review)")
-            
-        except Exception as e:
-            print(f"❌ Prediction failed: {e}")
-            all_passed = False
+        min_price, max_price = test['expected_range']
+        
+        print(f"Input: Income=${test['data']['median_income']*10000:,.0f}, "
+              f"Location=({test['data']['longitude']}, {test['data']['latitude']}), "
+              f"Proximity={test['data']['ocean_proximity']}")
+        print(f"Predicted price: ${price:,.2f}")
+        
+        if min_price <= price <= max_price:
+            print(f"✅ Prediction is within expected range (${min_price:,} - ${max_price:,})")
+        else:
+            print(f"⚠️  Prediction outside expected range (${min_price:,} - ${max_price:,})")
+            print("   (This might be okay, just flagging for review)")
     
-    if all_passed:
-        print("\n✅ All predictions completed successfully!\n")
-    else:
-        print("\n⚠️  Some predictions had issues\n")
+    # The other input paths must agree with the DataFrame batch
+    print("\nTest: Single dict and raw array inputs...")
+    try:
+        single_price = predictor.predict(TEST_CASES[0]['data'])
+        codes = sample_frame['ocean_proximity'].map(predictor.ocean_proximity_codes)
+        sample_values = sample_frame.assign(ocean_proximity=codes)[predictor.feature_names]
+        array_prices = predictor.predict_array(sample_values.to_numpy(dtype=float))
+    except Exception as e:
+        print(f"❌ Prediction failed: {e}\n")
+        return False, None
+    if not np.allclose(single_price, prices[:1]):
+        print(f"❌ Dict prediction ${single_price[0]:,.2f} differs from batch ${prices[0]:,.2f}\n")
+        return False, None
+    if not np.allclose(array_prices, prices):
+        print("❌ predict_array() differs from predict() on the same samples\n")
+        return False, None
+    print("✅ predict(dict) and predict_array() match predict(DataFrame)")
     
-    return all_passed
+    print("\n✅ All predictions completed successfully!\n")
+    return True, prices
 
 
-def test_batch_prediction(predictor: Any) -> bool:
+def test_batch_prediction(predictor: Any, prices: Any) -> bool:
     """Test batch predictions."""
-    print("=" * 70)
-    print("TEST 5: Batch Prediction")
-    print("=" * 70)
+    print(_header("TEST 5: Batch Prediction"))
     
     try:
-        import pandas as pd
-        
-        # Create batch data
-        batch_data = pd.DataFrame([
-            {
-                'longitude': -122.23, 'latitude': 37.88,
-                'housing_median_age': 41.0, 'total_rooms': 880.0,
-                'total_bedrooms': 129.0, 'population': 322.0,
-                'households': 126.0, 'median_income': 8.3252,
-                'ocean_proximity': 'NEAR BAY'
-            },
-            {
-                'longitude': -119.56, 'latitude': 36.78,
-                'housing_median_age': 15.0, 'total_rooms': 4500.0,
-                'total_bedrooms': 800.0, 'population': 1800.0,
-                'households': 750.0, 'median_income': 3.2,
-                'ocean_proximity': 'INLAND'
-            }
-        ])
+        if prices is None:
+            raise RuntimeError("no predictions from test 4 to compare against")
         
-        predictions = predictor.predict(batch_data)
+        # Predict the first two test cases as a list of dicts and check them
+        # against the same rows of the DataFrame batch from test 4
+        predictions = predictor.predict([test['data'] for test in TEST_CASES[:2]])
+        if len(predictions) != 2 or not np.allclose(predictions, prices[:2]):
+            raise RuntimeError(
+                f"list-of-dicts predictions {list(predictions)} differ from "
+                f"DataFrame predictions {list(prices[:2])}"
+            )
         
-        print(f"✅ Successfully predicted {len(predictions)} houses in batch:")
-        for i, price in enumerate(predictions, 1):
-            print(f"   House {i}: ${price:,.2f}")
+        # Format all rows first and write them at once
+        lines = [f"✅ Successfully predicted {len(predictions)} houses in batch:"]
+        lines.extend(f"   House {i}: ${price:,.2f}" for i, price in enumerate(predictions, 1))
+        sys.stdout.write("\n".join(lines) + "\n")
         
         print("\n✅ Batch prediction works!\n")
         return True
@@ -214,21 +232,15 @@ def test_batch_prediction(predictor: Any) -> bool:
         return False
 
 
-def test_validation(predictor: Any) -> bool:
+def test_validation(predictor: Any, sample_frame: Any) -> bool:
     """Test input validation."""
-    print("=" * 70)
-    print("TEST 6: Input Validation")
-    print("=" * 70)
+    print(_header("TEST 6: Input Validation"))
     
     # Test with missing feature
     print("\nTest: Missing required feature...")
     try:
-        import pandas as pd
-        invalid_data = pd.DataFrame([{
-            'longitude': -122.23,
-            'latitude': 37.88,
-            # Missing other required features
-        }])
+        # Only location columns, all other required features missing
+        invalid_data = sample_frame.iloc[[0]][['longitude', 'latitude']]
         predictor.predict(invalid_data)
         print("❌ Should have raised an error for missing features")
         return False
@@ -238,14 +250,7 @@ def test_validation(predictor: Any) -> bool:
     # Test with invalid ocean_proximity
     print("\nTest: Invalid ocean_proximity value...")
     try:
-        import pandas as pd
-        invalid_data = pd.DataFrame([{
-            'longitude': -122.23, 'latitude': 37.88,
-            'housing_median_age': 41.0, 'total_rooms': 880.0,
-            'total_bedrooms': 129.0, 'population': 322.0,
-            'households': 126.0, 'median_income': 8.3252,
-            'ocean_proximity': 'INVALID_VALUE'
-        }])
+        invalid_data = sample_frame.iloc[[0]].assign(ocean_proximity='INVALID_VALUE')
         predictor.predict(invalid_data)
         print("❌ Should have raised an error for invalid ocean_proximity")
         return False
@@ -258,9 +263,10 @@ def test_validation(predictor: Any) -> bool:
 
 def main() -> None:
     """Run all tests."""
-    print("\n" + "=" * 70)
+    global np
+    print("\n" + BANNER)
     print("🏠 CALIFORNIA HOUSE PRICE PREDICTION - DEPLOYMENT READINESS CHECK")
-    print("=" * 70 + "\n")
+    print(BANNER + "\n")
     
     results: list[tuple[str, bool]] = []
     
@@ -271,6 +277,13 @@ def main() -> None:
         print("\n❌ Cannot continue without required packages. Install them first.")
         sys.exit(1)
     
+    # numpy and pandas are only imported once test 1 has confirmed they are
+    # installed. The test-case inputs are built into one frame and sliced by
+    # the later tests.
+    import numpy as np
+    import pandas as pd
+    sample_frame = pd.DataFrame([test['data'] for test in TEST_CASES])
+    
     # Test 2: Files
     results.append(("Required files", test_files()))
     
@@ -287,18 +300,17 @@ def main() -> None:
         sys.exit(1)
     
     # Test 4: Predictions
-    results.append(("Predictions", test_prediction(predictor)))
+    success, prices = test_prediction(predictor, sample_frame)
+    results.append(("Predictions", success))
     
     # Test 5: Batch prediction
-    results.append(("Batch prediction", test_batch_prediction(predictor)))
+    results.append(("Batch prediction", test_batch_prediction(predictor, prices)))
     
     # Test 6: Validation
-    results.append(("Input validation", test_validation(predictor)))
+    results.append(("Input validation", test_validation(predictor, sample_frame)))
     
     # Summary
-    print("=" * 70)
-    print("SUMMARY")
-    print("=" * 70)
+    print(_header("SUMMARY"))
     
     for test_name, passed in results:
         status = "✅ PASS" if passed else "❌ FAIL"
@@ -306,10 +318,10 @@ def main() -> None:
     
     all_passed = all(result[1] for result in results)
     
-    print("\n" + "=" * 70)
+    print("\n" + BANNER)
     if all_passed:
         print("🎉 ALL TESTS PASSED! Your model is ready for deployment!")
-        print("=" * 70)
+        print(BANNER)
         print("\nNext steps:")
         print("1. Review the DEPLOYMENT_GUIDE.md file")
         print("2. Set up Git LFS: git lfs install")
@@ -318,7 +330,7 @@ def main() -> None:
         print("\n✨ Your model will be live on Hugging Face Model Hub soon!")
     else:
         print("⚠️  SOME TESTS FAILED - Please fix the issues above")
-        print("=" * 70)
+        print(BANNER)
         sys.exit(1)
     
     print()
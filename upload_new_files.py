@@ -1,8 +1,15 @@
-from huggingface_hub import HfApi
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from huggingface_hub import HfApi, get_token
 import os
+import sys
 
-api = HfApi()
-token = os.getenv('HF_TOKEN')  # Get token from environment variable
+# Environment variables first, then the token saved by `huggingface-cli login`
+token = os.environ.get('HF_TOKEN') or os.environ.get('HUGGING_FACE_HUB_TOKEN') or get_token()
+if not token:
+    print("❌ Run `huggingface-cli login` or set HF_TOKEN to a token with write access")
+    sys.exit(1)
+# One authenticated client shared by every upload call
+api = HfApi(token=token)
 repo_id = 'niru-nny/house-price-prediction'
 
 # New files to upload
@@ -12,23 +19,38 @@ files_to_upload = [
     'INFERENCE_DEPLOYMENT.md',
 ]
 
+
+def upload(file: str, filepath: str) -> None:
+    """Upload one file from an open handle so it is streamed, not buffered whole."""
+    with open(filepath, 'rb') as fh:
+        api.upload_file(
+            path_or_fileobj=fh,
+            path_in_repo=file,
+            repo_id=repo_id,
+            repo_type='model',
+        )
+
+
 print("📤 Uploading new files to Hugging Face...\n")
 
+# Skip missing files up front, then upload the rest in parallel
+existing: list[tuple[str, str]] = []
 for file in files_to_upload:
     filepath = os.path.join('.', file)
     if os.path.exists(filepath):
-        try:
-            api.upload_file(
-                path_or_fileobj=filepath,
-                path_in_repo=file,
-                repo_id=repo_id,
-                token=token,
-                repo_type='model',
-            )
-            print(f"✅ {file}")
-        except Exception as e:
-            print(f"❌ {file}: {str(e)[:100]}")
+        existing.append((file, filepath))
     else:
         print(f"⏭️  {file} (not found)")
 
+if existing:
+    with ThreadPoolExecutor(max_workers=min(8, len(existing))) as executor:
+        futures = {executor.submit(upload, file, filepath): file for file, filepath in existing}
+        for future in as_completed(futures):
+            file = futures[future]
+            try:
+                future.result()
+                print(f"✅ {file}")
+            except Exception as e:
+                print(f"❌ {file}: {str(e)[:100]}")
+
 print("\n🎉 Upload complete!")
\ No newline at end of file
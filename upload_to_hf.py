@@ -1,16 +1,35 @@
-from huggingface_hub import HfApi
+from huggingface_hub import HfApi, get_token
+import hashlib
+import importlib.util
+import joblib
 import os
+import sys
+import tempfile
 
-api = HfApi()
-token = os.environ.get('HF_TOKEN', 'YOUR_TOKEN_HERE')
+# Environment variables first, then the token saved by `huggingface-cli login`
+token = os.environ.get('HF_TOKEN') or os.environ.get('HUGGING_FACE_HUB_TOKEN') or get_token()
+if not token:
+    print("❌ Run `huggingface-cli login` or set HF_TOKEN to a token with write access")
+    sys.exit(1)
+# One authenticated client shared by every upload call
+api = HfApi(token=token)
 repo_id = 'niru-nny/house-price-prediction'
 
+MODEL_PATH = 'house_price_model.joblib'
+PIPELINE_PATH = 'preprocessing_pipeline.joblib'
+ONNX_PATH = 'house_price_model.onnx'
+# ONNX metadata key holding the SHA-256 of the joblib model it was converted
+# from (written by convert_to_onnx.py)
+ONNX_SOURCE_HASH_KEY = 'source_model_sha256'
+
 # Files to upload
 files_to_upload = [
-    'house_price_model.joblib',
-    'preprocessing_pipeline.joblib',
+    MODEL_PATH,
+    PIPELINE_PATH,
+    ONNX_PATH,
     'README.md',
     'inference.py',
+    'convert_to_onnx.py',
     'example_usage.py',
     'test_deployment.py',
     'requirements.txt',
@@ -24,24 +43,117 @@ files_to_upload = [
     'housepriceprediction.ipynb',
 ]
 
+
+def file_digest(path: str, git_blob: bool) -> str:
+    """Hash a file in 1 MiB chunks: SHA-256 for LFS files, git blob SHA-1 otherwise."""
+    if git_blob:
+        h = hashlib.sha1(f"blob {os.path.getsize(path)}\0".encode())
+    else:
+        h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def replace_atomically(path: str, write) -> None:
+    """Call write(tmp_path) on a temp file next to path, then move it over path."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix='.tmp')
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def retag_onnx(old_hash: str, new_hash: str) -> None:
+    """Point the ONNX model's source hash at the re-dumped joblib model."""
+    import onnx  # type: ignore
+    onnx_model = onnx.load(ONNX_PATH)
+    for prop in onnx_model.metadata_props:
+        if prop.key == ONNX_SOURCE_HASH_KEY and prop.value == old_hash:
+            prop.value = new_hash
+            replace_atomically(ONNX_PATH, lambda tmp_path: onnx.save(onnx_model, tmp_path))
+            print(f"🏷️  {ONNX_PATH}: source hash updated for the compressed model")
+            return
+    print(f"⚠️  {ONNX_PATH} was not converted from {MODEL_PATH}; re-run convert_to_onnx.py")
+
+
+# Optional: shrink the joblib artifacts before upload (COMPRESS_ARTIFACTS=1).
+# Compressed dumps are ~5x smaller to download, but joblib cannot memory-map
+# them, so this is opt-in and rewrites the local files in place.
+if os.environ.get('COMPRESS_ARTIFACTS') == '1':
+    # The ONNX file records the SHA-256 of the model's bytes, which change when
+    # it is re-dumped; retagging it needs the onnx package
+    onnx_tagged = os.path.exists(ONNX_PATH)
+    if onnx_tagged and importlib.util.find_spec('onnx') is None:
+        print(f"⚠️  Not compressing {MODEL_PATH}: updating {ONNX_PATH} needs `pip install onnx`")
+        compress_files = [PIPELINE_PATH]
+    else:
+        compress_files = [MODEL_PATH, PIPELINE_PATH]
+    
+    for jf in compress_files:
+        if not os.path.exists(jf):
+            continue
+        with open(jf, 'rb') as f:
+            head = f.read(1)
+        # Uncompressed joblib files are plain pickles starting with the PROTO opcode
+        if head == b'\x80':
+            before = os.path.getsize(jf)
+            old_hash = file_digest(jf, git_blob=False)
+            # Dump next to the original and swap it in atomically, so a failed
+            # or interrupted dump never leaves a truncated artifact behind
+            estimator = joblib.load(jf)
+            replace_atomically(jf, lambda tmp_path: joblib.dump(estimator, tmp_path, compress=3))
+            print(f"🗜️  {jf}: {before/(1024*1024):.1f} MB -> {os.path.getsize(jf)/(1024*1024):.1f} MB")
+            if jf == MODEL_PATH and onnx_tagged:
+                retag_onnx(old_hash, file_digest(jf, git_blob=False))
+    print()
+
 print("📤 Uploading files to Hugging Face...\n")
 
+# Fetch remote file hashes once so unchanged files are not uploaded again
+try:
+    info = api.repo_info(repo_id, repo_type='model', files_metadata=True)
+    remote = {s.rfilename: s for s in info.siblings or []}
+except Exception as e:
+    print(f"⚠️  Could not fetch remote file list, uploading everything: {str(e)[:100]}")
+    remote = {}
+
+# Skip missing and unchanged files up front, then upload the rest as a single commit
+existing: list[str] = []
 for file in files_to_upload:
-    filepath = os.path.join('.', file)
-    if os.path.exists(filepath):
-        try:
-            path_in_repo = file
-            api.upload_file(
-                path_or_fileobj=filepath,
-                path_in_repo=path_in_repo,
-                repo_id=repo_id,
-                token=token,
-                repo_type='model',
-            )
-            print(f"✅ {file}")
-        except Exception as e:
-            print(f"❌ {file}: {str(e)[:100]}")
-    else:
+    if not os.path.exists(os.path.join('.', file)):
         print(f"⏭️  {file} (not found)")
+        continue
+    sibling = remote.get(file)
+    if sibling is not None:
+        if sibling.lfs is not None:
+            unchanged = file_digest(file, git_blob=False) == sibling.lfs.sha256
+        else:
+            unchanged = file_digest(file, git_blob=True) == sibling.blob_id
+        if unchanged:
+            print(f"⏭️  {file} (unchanged)")
+            continue
+    existing.append(file)
+
+if existing:
+    try:
+        commit = api.upload_folder(
+            folder_path='.',
+            allow_patterns=existing,
+            repo_id=repo_id,
+            repo_type='model',
+            commit_message=f"Upload {len(existing)} files",
+        )
+        for file in existing:
+            print(f"✅ {file}")
+        print(f"\n🔗 {commit.commit_url}")
+    except Exception as e:
+        print(f"❌ Upload failed: {str(e)[:200]}")
+else:
+    print("\n✅ Nothing to upload, the repository is up to date")
 
 print("\n🎉 Upload complete!")